@@ -0,0 +1,138 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; without it the kernels run as plain Python loops
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        def wrap(func):
+            return func
+        return wrap
+
+@njit(cache=True, fastmath=True)
+def sma_signals(close, short_window, long_window):
+    """
+    Computes the fast/slow moving averages, crossover signal, crossover
+    marker and position for a close-price series in a single fused pass.
+
+    Args:
+        close (numpy.ndarray): 1-D array of closing prices.
+        short_window (int): The number of days for the short moving average.
+        long_window (int): The number of days for the long moving average.
+
+    Returns:
+        tuple: (fast, slow, signal, crossover, position) arrays, each the
+               same length as close.
+    """
+    n = close.size
+    fast = np.full(n, np.nan)
+    slow = np.full(n, np.nan)
+    signal = np.zeros(n)
+    crossover = np.full(n, np.nan)
+    position = np.full(n, np.nan)
+
+    sum_short = 0.0
+    sum_long = 0.0
+    for i in range(n):
+        # Maintain running window sums instead of re-summing each window
+        sum_short += close[i]
+        sum_long += close[i]
+        if i >= short_window:
+            sum_short -= close[i - short_window]
+        if i >= long_window:
+            sum_long -= close[i - long_window]
+
+        if i >= short_window - 1:
+            fast[i] = sum_short / short_window
+        if i >= long_window - 1:
+            slow[i] = sum_long / long_window
+            # Signal of 1.0 when the fast MA is above the slow MA
+            if fast[i] > slow[i]:
+                signal[i] = 1.0
+
+        if i >= 1:
+            crossover[i] = signal[i] - signal[i - 1]
+            position[i] = signal[i - 1]
+
+    return fast, slow, signal, crossover, position
+
+@njit(cache=True)
+def compute_metrics(strategy_return, daily_return):
+    """
+    Fuses the whole metric pipeline (cumulative products, drawdown and the
+    mean/variance/covariance accumulators) into one pass over the return
+    arrays, instead of a dozen separate pandas passes.
+
+    Args:
+        strategy_return (numpy.ndarray): Daily strategy returns (NaN until
+                                         the first position day).
+        daily_return (numpy.ndarray): Daily benchmark returns (NaN first entry).
+
+    Returns:
+        tuple: (total_strategy_return, total_benchmark_return,
+                mean_strategy_return, std_strategy_return, max_drawdown,
+                covariance, benchmark_variance, mean_benchmark_return)
+               as scalars; moments use ddof=1 like pandas.
+    """
+    n = daily_return.size
+
+    cum_bench = 1.0
+    cum_strat = 1.0
+    cum_max = -np.inf
+    max_drawdown = np.nan
+
+    # Welford accumulators for the strategy returns and, on the same
+    # observations, the co-moment with the benchmark returns
+    count_s = 0
+    mean_s = 0.0
+    m2_s = 0.0
+    mean_b_paired = 0.0
+    comoment = 0.0
+
+    # Benchmark mean/variance run over every daily return
+    count_b = 0
+    mean_b = 0.0
+    m2_b = 0.0
+
+    for i in range(n):
+        daily = daily_return[i]
+        if not np.isnan(daily):
+            cum_bench *= 1.0 + daily
+
+            count_b += 1
+            delta_b = daily - mean_b
+            mean_b += delta_b / count_b
+            m2_b += delta_b * (daily - mean_b)
+
+        strat = strategy_return[i]
+        if np.isnan(strat):
+            continue
+
+        cum_strat *= 1.0 + strat
+        if cum_strat > cum_max:
+            cum_max = cum_strat
+        drawdown = (cum_max - cum_strat) / cum_max
+        if np.isnan(max_drawdown) or drawdown > max_drawdown:
+            max_drawdown = drawdown
+
+        count_s += 1
+        delta_s = strat - mean_s
+        mean_s += delta_s / count_s
+        m2_s += delta_s * (strat - mean_s)
+        mean_b_paired += (daily - mean_b_paired) / count_s
+        comoment += delta_s * (daily - mean_b_paired)
+
+    total_strategy_return = cum_strat - 1.0 if count_s > 0 else np.nan
+    total_benchmark_return = cum_bench - 1.0
+
+    mean_strategy_return = mean_s if count_s > 0 else np.nan
+    std_strategy_return = np.sqrt(m2_s / (count_s - 1)) if count_s > 1 else np.nan
+    covariance = comoment / (count_s - 1) if count_s > 1 else np.nan
+    benchmark_variance = m2_b / (count_b - 1) if count_b > 1 else np.nan
+    mean_benchmark_return = mean_b if count_b > 0 else np.nan
+
+    return (total_strategy_return, total_benchmark_return,
+            mean_strategy_return, std_strategy_return, max_drawdown,
+            covariance, benchmark_variance, mean_benchmark_return)
@@ -4,8 +4,46 @@ import numpy as np
 import matplotlib
 import matplotlib.pyplot as plt
 
+from _kernels import sma_signals, compute_metrics
+
+try:
+    from bottleneck import move_mean
+except ImportError:
+    # bottleneck is optional; fall back to the cumulative-sum SMA
+    move_mean = None
+
+try:
+    # Cache downloaded price data on disk so identical requests skip the
+    # network on subsequent runs
+    from joblib import Memory
+    download = Memory('./.yf_cache', verbose=0).cache(yf.download)
+except ImportError:
+    download = yf.download
+
 matplotlib.use('TkAgg')
 
+def _sma(a, w):
+    """
+    Computes a simple moving average of a 1-D array in a single O(n)
+    cumulative-sum pass, avoiding pandas' rolling-window overhead. Uses
+    bottleneck's C moving-mean kernel instead when it is installed.
+
+    Args:
+        a (numpy.ndarray): 1-D array of values.
+        w (int): The window length in elements.
+
+    Returns:
+        numpy.ndarray: Array the same length as a, NaN for the first w-1 entries.
+    """
+    if move_mean is not None:
+        return move_mean(a, w, min_count=w)
+    c = np.empty(a.size + 1, dtype=a.dtype)
+    c[0] = 0.0
+    np.cumsum(a, out=c[1:])
+    out = np.full(a.size, np.nan, dtype=a.dtype)
+    out[w - 1:] = (c[w:] - c[:-w]) / w
+    return out
+
 def calc_strategy_performance(data, short_window, long_window):
     """
     Calculates the trading signals and positions for a simple moving average
@@ -21,78 +59,90 @@ def calc_strategy_performance(data, short_window, long_window):
                       Signal and Position columns added.
     """
     
-    df = data.copy() # Copydata to avoid modifying the original DataFrame
-    
-    # Calculate the moving averages using the user defined windows
-    df['Fast_MA'] = df['Close'].rolling(window=short_window).mean()
-    df['Slow_MA'] = df['Close'].rolling(window=long_window).mean()
+    # All the numeric work happens in one fused (optionally JIT-compiled)
+    # pass over the close prices; this function only attaches the columns
+    fast, slow, signal, crossover, position = sma_signals(
+        data['Close'].to_numpy(), short_window, long_window)
 
-   
-    df['Signal'] = 0.0
-    
-    # Generate a signal of 1.0 when fast MA crosses above the slow MA
-    df.loc[df.index[long_window:], 'Signal'] = np.where(df['Fast_MA'][long_window:] > df['Slow_MA'][long_window:], 1.0, 0.0)
-    
-    # Creating a crossover signal that only maps changes for buy/sell signals on plot
-    df['Crossover'] = df['Signal'].diff()
-    
-    # Position column indicating if position is held based on signal from the PREVIOUS day.
-    df['Position'] = df['Signal'].shift(1)
-    
-    return df
+    # A single assign copies the original frame and attaches every new
+    # column at once, so pandas consolidates its blocks only once
+    return data.assign(Fast_MA=fast,
+                       Slow_MA=slow,
+                       Signal=signal,
+                       Crossover=crossover,
+                       Position=position)
 
 def calculate_metrics(data):
     """
     Calculates key performance metrics of the trading strategy.
-    
+
     Args:
         data (panda.DataFrame): DataFrame with Close and Position columns.
-    
+
     Returns:
         dict: A dictionary of performance metrics.
     """
-    # Calculate returns
-    data['Daily_Return'] = data['Close'].pct_change()
-    data['Strategy_Return'] = data['Daily_Return'] * data['Position'].shift(1) # Shift position to avoid lookahead bias
-    
-    # Calculate cumulative returns
-    data['Cumulative_Benchmark'] = (1 + data['Daily_Return']).cumprod()
-    data['Cumulative_Strategy'] = (1 + data['Strategy_Return']).cumprod()
-    
-    # Total returns
-    total_strategy_return = data['Cumulative_Strategy'].iloc[-1] - 1
-    total_benchmark_return = data['Cumulative_Benchmark'].iloc[-1] - 1 # Create a benchmark return for comparison
-    
-    # Sharpe Ratio
-    mean_daily_return = data['Strategy_Return'].mean()
-    std_daily_return = data['Strategy_Return'].std()
+    close = data['Close'].to_numpy()
+    position = data['Position'].to_numpy()
+
+    daily_return = np.full(close.size, np.nan)
+    daily_return[1:] = close[1:] / close[:-1] - 1.0
+
+    # Shift position to avoid lookahead bias
+    strategy_return = np.full(close.size, np.nan)
+    strategy_return[1:] = daily_return[1:] * position[:-1]
+
+    return _metrics_from_returns(strategy_return, daily_return)
+
+def _metrics_from_returns(strategy_return, daily_return):
+    """
+    Builds the metric dictionary from raw return arrays, with no pandas
+    involved. Fast path shared by calculate_metrics and any array-only caller.
+
+    Args:
+        strategy_return (numpy.ndarray): Daily strategy returns.
+        daily_return (numpy.ndarray): Daily benchmark returns.
+
+    Returns:
+        dict: A dictionary of performance metrics.
+    """
+    # Too few observations to say anything meaningful; bail out before the
+    # kernel so the sweep can discard these parameter sets cheaply
+    if np.count_nonzero(np.isfinite(strategy_return)) < 30:
+        return {"Total Strategy Return": np.nan,
+                "Total Buy-and-Hold Return": np.nan,
+                "Sharpe Ratio": -np.inf,
+                "Maximum Drawdown": np.nan,
+                "Beta": np.nan,
+                "Annualised Alpha": np.nan,
+                "Annualised Volatility": np.nan,
+                "Calmar Ratio": np.nan}
+
+    # All the per-row work happens in one fused kernel pass; only the
+    # scalar ratios are derived here
+    (total_strategy_return, total_benchmark_return, mean_daily_return,
+     std_daily_return, max_drawdown, covariance, benchmark_variance,
+     mean_benchmark_return) = compute_metrics(strategy_return, daily_return)
 
     # Handle the case of zero standard deviation to avoid division by zero
     if std_daily_return == 0:
         annualised_sharpe = np.nan
     else:
         annualised_sharpe = (mean_daily_return * 252) / (std_daily_return * np.sqrt(252))
-    
-    # Maximum Drawdown which is the maximum observed loss from a peak to a trough
-    data['Cumulative_Max'] = data['Cumulative_Strategy'].cummax()
-    data['Drawdown'] = (data['Cumulative_Max'] - data['Cumulative_Strategy']) / data['Cumulative_Max']
-    max_drawdown = data['Drawdown'].max()
-    
+
     # Beta formula, this is a measure of volatility relative to the market, higher beta means more volatility
-    beta = data['Strategy_Return'].cov(data['Daily_Return']) / data['Daily_Return'].var()
+    beta = covariance / benchmark_variance
 
     # Alpha formula, this is the excess return of the strategy over the benchmark, higher alpha means better performance
-    mean_strategy_return = data['Strategy_Return'].mean()
-    mean_benchmark_return = data['Daily_Return'].mean()
-    alpha = mean_strategy_return - (beta * mean_benchmark_return)
+    alpha = mean_daily_return - (beta * mean_benchmark_return)
     annualised_alpha = alpha * 252
 
     # Annualised volatility, which is the standard deviation of returns scaled to annual terms
-    annualised_volatility = data['Strategy_Return'].std() * np.sqrt(252)
+    annualised_volatility = std_daily_return * np.sqrt(252)
 
     # Calmar ratio, which is a risk-adjusted return measure, a measure of return per unit of risk
-    annualised_return = data['Strategy_Return'].mean() * 252
-    if max_drawdown == 0: 
+    annualised_return = mean_daily_return * 252
+    if max_drawdown == 0:
         calmar_ratio = np.nan
     else:
         calmar_ratio = annualised_return / max_drawdown
@@ -106,46 +156,107 @@ def calculate_metrics(data):
             "Annualised Volatility": annualised_volatility,
             "Calmar Ratio": calmar_ratio}
 
+def calc_return_series(data):
+    """
+    Adds the return, cumulative return and drawdown columns used by
+    plot_data. Kept separate from calculate_metrics so the metric
+    computation stays free of per-column DataFrame writes.
+
+    Args:
+        data (panda.DataFrame): DataFrame with Close and Position columns.
+
+    Returns:
+        panda.DataFrame: The DataFrame with the return columns added.
+    """
+    daily_return = data['Close'].pct_change()
+    strategy_return = daily_return * data['Position'].shift(1) # Shift position to avoid lookahead bias
+    cumulative_benchmark = (1 + daily_return).cumprod()
+    cumulative_strategy = (1 + strategy_return).cumprod()
+    cumulative_max = cumulative_strategy.cummax()
+    drawdown = (cumulative_max - cumulative_strategy) / cumulative_max
+    return data.assign(Daily_Return=daily_return,
+                       Strategy_Return=strategy_return,
+                       Cumulative_Benchmark=cumulative_benchmark,
+                       Cumulative_Strategy=cumulative_strategy,
+                       Cumulative_Max=cumulative_max,
+                       Drawdown=drawdown)
+
+def sweep(close, daily_return, short_windows, long_windows):
+    """
+    Evaluates the annualised Sharpe Ratio of every (short, long) window pair
+    in one broadcast pass over NumPy arrays instead of a Python loop.
+
+    Args:
+        close (numpy.ndarray): 1-D array of closing prices.
+        daily_return (numpy.ndarray): Precomputed daily benchmark returns.
+        short_windows (iterable): Candidate short moving average windows.
+        long_windows (iterable): Candidate long moving average windows.
+
+    Returns:
+        numpy.ndarray: Sharpe Ratio matrix of shape (len(short_windows),
+                       len(long_windows)); invalid pairs are -inf.
+    """
+    shorts = np.asarray(short_windows)
+    longs = np.asarray(long_windows)
+
+    # Compute each unique window once and share it between the two axes
+    sma = {w: _sma(close, w) for w in set(shorts) | set(longs)}
+    fast = np.stack([sma[s] for s in shorts])  # shape (S, T)
+    slow = np.stack([sma[l] for l in longs])   # shape (L, T)
+
+    # Signal tensor for every pair; rows before the slow window fills stay
+    # flat. Kept in the close dtype so a float32 sweep stays float32 throughout
+    signal = np.where(np.isnan(slow)[None, :, :], 0.0,
+                      (fast[:, None, :] > slow[None, :, :]).astype(close.dtype))
+
+    # Strategy returns lag the signal by two days (signal -> position -> trade),
+    # matching calc_strategy_performance and calculate_metrics
+    strategy_return = np.full(signal.shape, np.nan, dtype=signal.dtype)
+    strategy_return[:, :, 2:] = signal[:, :, :-2] * daily_return[None, None, 2:]
+
+    mean = np.nanmean(strategy_return, axis=-1)
+    std = np.nanstd(strategy_return, axis=-1, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Sharpe differences matter at ~1e-3, so the ratios go back to float64
+        sharpe = ((mean * 252) / (std * np.sqrt(252))).astype(np.float64)
+
+    # Mask flat strategies and combinations where short is not less than long
+    sharpe[~np.isfinite(sharpe)] = -np.inf
+    sharpe[shorts[:, None] >= longs[None, :]] = -np.inf
+    return sharpe
+
 def optimise_strategy(data):
     """
     Performs a parameter sweep to find the optimal short and long window
     based on the highest Sharpe Ratio.
-    
+
     Args:
         data (panda.DataFrame): The stock price data.
-        
+
     Returns:
         tuple: A tuple containing the best short and long window values.
     """
-    best_sharpe = -np.inf
-    best_params = (0, 0)
-    
     print("\n--- Running Parameter Optimization ---")
-    
+
     # Define a range of values for the short and long windows
-    short_window_range = range(10, 61, 5)  
-    long_window_range = range(100, 251, 10)  
-
-    for short in short_window_range:
-        for long in long_window_range:
-            # Skip invalid combinations where short window is not less than long
-            if short >= long:
-                continue
-            
-            # Calculate strategy performance for this parameter set
-            temp_data = calc_strategy_performance(data, short, long)
-            
-            # Calculate metrics
-            metrics = calculate_metrics(temp_data)
-            
-            # Check if this combination has a better Sharpe Ratio
-            if metrics['Sharpe Ratio'] > best_sharpe:
-                best_sharpe = metrics['Sharpe Ratio']
-                best_params = (short, long)
-                print(f"New best found: Short={short}, Long={long}, Sharpe={best_sharpe:.2f}")
+    short_window_range = range(10, 61, 5)
+    long_window_range = range(100, 251, 10)
+
+    # Daily returns are the same for every parameter pair; compute them once.
+    # float32 is plenty for ranking Sharpe Ratios and halves the bytes the
+    # (S, L, T) tensor moves through the caches
+    close = data['Close'].to_numpy(np.float32)
+    daily_return = np.full(close.size, np.nan, dtype=np.float32)
+    daily_return[1:] = close[1:] / close[:-1] - 1.0
+
+    # Score the whole grid in one vectorized pass
+    sharpe = sweep(close, daily_return, short_window_range, long_window_range)
+
+    best_short, best_long = np.unravel_index(np.argmax(sharpe), sharpe.shape)
+    best_params = (short_window_range[best_short], long_window_range[best_long])
 
     print("--- Optimization Complete ---")
-    print(f"Best parameters are Short={best_params[0]}, Long={best_params[1]}")
+    print(f"Best parameters are Short={best_params[0]}, Long={best_params[1]}, Sharpe={sharpe[best_short, best_long]:.2f}")
     return best_params
 
 def print_metrics(metrics):
@@ -220,7 +331,7 @@ def plot_data(data, short_window, long_window, metrics, ticker_symbol):
 
 if __name__ == "__main__":
     ticker_symbol = input("Enter a ticker that you would like to analyze: ").upper()
-    data = yf.download(ticker_symbol, start='2020-01-01', end='2024-01-01', auto_adjust=True)
+    data = download(ticker_symbol, start='2020-01-01', end='2024-01-01', auto_adjust=True)
     
     
     print("\nSelect an option:")
@@ -243,5 +354,6 @@ if __name__ == "__main__":
     
     metrics = calculate_metrics(data_with_signals)
     print_metrics(metrics)
-    
+
+    data_with_signals = calc_return_series(data_with_signals)
     plot_data(data_with_signals, short_window, long_window, metrics, ticker_symbol)
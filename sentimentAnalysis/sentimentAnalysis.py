@@ -1,52 +1,82 @@
 import requests
 import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
 import time
-from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+try:
+    # Transparently caches the GNews responses on disk for a day, so
+    # re-runs skip the network entirely
+    import requests_cache
+    requests_cache.install_cache('gnews_cache', expire_after=86400)
+except ImportError:
+    pass
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to requests' stdlib json parsing
+    orjson = None
 
 def fetch_gnews_headlines(api_key, query, start_date, end_date):
-    
-    all_headlines = []
-    
-    # GNews API requires a full datetime format for the time range
-    time_from_iso = datetime.strptime(start_date, '%Y-%m-%d').isoformat() + 'Z'
-    time_to_iso = datetime.strptime(end_date, '%Y-%m-%d').isoformat() + 'Z'
+
+    # One window per day, since the API caps each response at 100 articles;
+    # a single request over several months silently truncates the data
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
 
     url = 'https://gnews.io/api/v4/search'
-    params = {
-        'q': query,
-        'from': time_from_iso,
-        'to': time_to_iso,
-        'token': api_key
-    }
-    
     page_size = 100
-    params['max'] = page_size
 
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status() 
-        data = response.json()
-
-        if 'articles' in data:
-            for article in data['articles']:
-                all_headlines.append({
-                    'publishedAt': article['publishedAt'],
-                    'title': article['title']
-                })
-        else:
-            print(f"No articles found for {query} from {start_date} to {end_date}")
+    # Shared session gives HTTP keep-alive, so the threads reuse connections
+    # instead of paying a TCP/TLS handshake per day
+    session = requests.Session()
+
+    def fetch_day(day):
+        # GNews API requires a full datetime format for the time range
+        params = {
+            'q': query,
+            'from': day.isoformat() + 'Z',
+            'to': (day + timedelta(days=1)).isoformat() + 'Z',
+            'token': api_key,
+            'max': page_size
+        }
+        response = session.get(url, params=params)
+        response.raise_for_status()
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
 
+    try:
+        # The GIL is released during the socket reads, so threads overlap
+        # the network latency of the per-day requests
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            responses = list(executor.map(fetch_day, days))
     except requests.exceptions.RequestException as e:
         print(f"Error fetching data from GNews: {e}")
-    
-    df = pd.DataFrame(all_headlines)
-    if not df.empty:
-        df['publishedAt'] = pd.to_datetime(df['publishedAt'])
-        df.set_index('publishedAt', inplace=True)
-    
+        responses = []
+
+    # Collect plain per-column lists; handing pandas two homogeneous columns
+    # beats a list of per-row dicts it would have to infer a schema from
+    times = []
+    titles = []
+    for data in responses:
+        for article in data.get('articles', []):
+            times.append(article['publishedAt'])
+            titles.append(article['title'])
+
+    if not times:
+        print(f"No articles found for {query} from {start_date} to {end_date}")
+        return pd.DataFrame()
+
+    df = pd.DataFrame({'publishedAt': pd.to_datetime(times), 'title': titles})
+    df.set_index('publishedAt', inplace=True)
+
     return df
 def store_to_csv(df, filename):
     df.to_csv(filename)
@@ -71,8 +101,12 @@ def sentiment_analysis(TICKER_QUERY):
         return
     else:
         print(f"Data for {TICKER_QUERY} loaded successfully.")
-    df['sentiment'] = df['title'].apply(lambda x: TextBlob(x).sentiment.polarity)
-    df['sentiment_label'] = df['sentiment'].apply(lambda x: 'positive' if x > 0 else 'negative' if x < 0 else 'neutral')
+    # Score the whole column in one batch instead of a pandas .apply per row
+    analyser = SentimentIntensityAnalyzer()
+    scores = np.fromiter((analyser.polarity_scores(title)['compound'] for title in df['title']),
+                         dtype=np.float64, count=len(df))
+    df['sentiment'] = scores
+    df['sentiment_label'] = np.select([scores > 0, scores < 0], ['positive', 'negative'], default='neutral')
     print(f"Sentiment analysis completed for {TICKER_QUERY}. Here are the results:")
     print(df[['title', 'sentiment', 'sentiment_label']].head(10))
     
@@ -82,8 +116,11 @@ def daily_sentiment(dataframe):
         print("No data available for sentiment analysis.")
         return None
     
-    daily_sentiment = dataframe.resample('D').mean()
-    daily_sentiment['sentiment_label'] = daily_sentiment['sentiment'].apply(lambda x: 'positive' if x > 0 else 'negative' if x < 0 else 'neutral')
+    # Resample only the numeric sentiment column; keeping the title strings
+    # out means pandas never has to inspect (or choke on) them
+    daily_sentiment = dataframe[['sentiment']].resample('D').mean()
+    daily_scores = daily_sentiment['sentiment'].to_numpy()
+    daily_sentiment['sentiment_label'] = np.select([daily_scores > 0, daily_scores < 0], ['positive', 'negative'], default='neutral')
     print("Daily sentiment analysis completed.")
     print(daily_sentiment)
     return daily_sentiment